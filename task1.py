@@ -1,140 +1,196 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Dict, Optional
 from statistics import median
+from itertools import chain, count
+from operator import attrgetter
+import logging
 import os
+import sys
 
 
 DEBUG = os.environ.get("DEBUG") == "1"
 
 
-def debug_log(message: str):
-    if DEBUG:
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        print(f"[DEBUG {timestamp}] {message}")
+_log = logging.getLogger(__name__)
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(
+    logging.Formatter("[DEBUG %(asctime)s.%(msecs)03d] %(message)s", "%H:%M:%S")
+)
+_log.addHandler(_handler)
+_log.setLevel(logging.DEBUG if DEBUG else logging.WARNING)
+_log.propagate = False
+
+
+@dataclass(slots=True)
+class Transaction:
+    date: datetime
+    type: str
+    amount: float
+    balance_after: float
 
 
 class BankAccount(ABC):
-    _account_counter = 1000
+    _counter = count(1000)
 
     def __init__(self, owner: str, initial_balance: float = 0):
-        self.account_number = f"ACC{BankAccount._account_counter}"
-        BankAccount._account_counter += 1
+        self.account_number = f"ACC{next(BankAccount._counter)}"
         self.balance = initial_balance
         self.owner = owner
-        self.transaction_history: List[Dict] = []
-
-        debug_log(
-            f"Creating account {self.account_number} for {owner} with balance {initial_balance}"
+        self.transaction_history: List[Transaction] = []
+        self._pending: Optional[List[tuple]] = None
+
+        _log.debug(
+            "Creating account %s for %s with balance %s",
+            self.account_number,
+            owner,
+            initial_balance,
         )
 
         if initial_balance > 0:
             self.transaction_history.append(
-                {
-                    "date": datetime.now(),
-                    "type": "opening",
-                    "amount": initial_balance,
-                    "balance_after": initial_balance,
-                }
+                Transaction(datetime.now(), "opening", initial_balance, initial_balance)
             )
 
-    def deposit(self, amount: float) -> bool:
-        debug_log(f"Account {self.account_number}: attempting deposit of {amount}")
+    def deposit(self, amount: float, _DEBUG=DEBUG) -> bool:
+        if __debug__ and _DEBUG:
+            _log.debug(
+                "Account %s: attempting deposit of %s", self.account_number, amount
+            )
         if amount <= 0:
-            debug_log(f"Account {self.account_number}: deposit failed - invalid amount")
+            if __debug__ and _DEBUG:
+                _log.debug(
+                    "Account %s: deposit failed - invalid amount", self.account_number
+                )
             return False
         self.balance += amount
-        self.transaction_history.append(
-            {
-                "date": datetime.now(),
-                "type": "deposit",
-                "amount": amount,
-                "balance_after": self.balance,
-            }
-        )
-        debug_log(
-            f"Account {self.account_number}: deposit successful, new balance: {self.balance}"
-        )
+        self._record("deposit", amount)
+        if __debug__ and _DEBUG:
+            _log.debug(
+                "Account %s: deposit successful, new balance: %s",
+                self.account_number,
+                self.balance,
+            )
         return True
 
-    def withdraw(self, amount: float) -> bool:
+    def withdraw(self, amount: float, _DEBUG=DEBUG) -> bool:
         withdrawal_limit = self.get_withdrawal_limit()
-        debug_log(
-            f"Account {self.account_number}: attempting withdrawal of {amount}, limit: {withdrawal_limit}"
-        )
+        if __debug__ and _DEBUG:
+            _log.debug(
+                "Account %s: attempting withdrawal of %s, limit: %s",
+                self.account_number,
+                amount,
+                withdrawal_limit,
+            )
 
         if amount <= 0:
-            debug_log(
-                f"Account {self.account_number}: withdrawal failed - invalid amount"
-            )
+            if __debug__ and _DEBUG:
+                _log.debug(
+                    "Account %s: withdrawal failed - invalid amount",
+                    self.account_number,
+                )
             return False
         if amount > withdrawal_limit:
-            debug_log(
-                f"Account {self.account_number}: withdrawal failed - exceeds limit"
-            )
+            if __debug__ and _DEBUG:
+                _log.debug(
+                    "Account %s: withdrawal failed - exceeds limit", self.account_number
+                )
             return False
         self.balance -= amount
-        self.transaction_history.append(
-            {
-                "date": datetime.now(),
-                "type": "withdrawal",
-                "amount": amount,
-                "balance_after": self.balance,
-            }
-        )
-        debug_log(
-            f"Account {self.account_number}: withdrawal successful, new balance: {self.balance}"
-        )
+        self._record("withdrawal", amount)
+        if __debug__ and _DEBUG:
+            _log.debug(
+                "Account %s: withdrawal successful, new balance: %s",
+                self.account_number,
+                self.balance,
+            )
         return True
 
+    def _record(self, transaction_type: str, amount: float):
+        if self._pending is not None:
+            self._pending.append((transaction_type, amount, self.balance))
+        else:
+            self.transaction_history.append(
+                Transaction(datetime.now(), transaction_type, amount, self.balance)
+            )
+
+    @contextmanager
+    def batch(self):
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = []
+        try:
+            yield self
+        finally:
+            pending, self._pending = self._pending, None
+            if pending:
+                now = datetime.now()
+                self.transaction_history.extend(
+                    Transaction(now, *entry) for entry in pending
+                )
+            _log.debug(
+                "Account %s: committed batch of %s transactions",
+                self.account_number,
+                len(pending),
+            )
+
     @abstractmethod
     def get_withdrawal_limit(self) -> float:
         pass
 
     @classmethod
     def create_account(cls, owner: str, initial_balance: float = 0, **kwargs):
-        debug_log(f"Creating account via class method for {owner}")
+        _log.debug("Creating account via class method for %s", owner)
         return cls(owner, initial_balance, **kwargs)
 
 
 class Card:
+    __slots__ = ("number", "card_type")
+
     def __init__(self, number: str, card_type: str):
         self.number = number
         self.card_type = card_type
-        debug_log(f"Card created: {number} ({card_type})")
+        _log.debug("Card created: %s (%s)", number, card_type)
 
 
 class CurrentAccount(BankAccount):
+    daily_limit = 50000
+
     def __init__(self, owner: str, initial_balance: float = 0, **kwargs):
         super().__init__(owner, initial_balance)
-        self.daily_limit = 50000
         self.linked_cards: List[Card] = []
-        debug_log(f"CurrentAccount initialized with daily limit: {self.daily_limit}")
+        _log.debug("CurrentAccount initialized with daily limit: %s", self.daily_limit)
 
     def get_withdrawal_limit(self) -> float:
         return min(self.balance, self.daily_limit)
 
     def add_card(self, card: Card):
         self.linked_cards.append(card)
-        debug_log(f"Card {card.number} linked to account {self.account_number}")
+        _log.debug("Card %s linked to account %s", card.number, self.account_number)
 
 
 class SavingsAccount(BankAccount):
+    monthly_limit = 100000
+
     def __init__(self, owner: str, initial_balance: float = 0, **kwargs):
         super().__init__(owner, initial_balance)
-        self.monthly_limit = 100000
-        debug_log(
-            f"SavingsAccount initialized with monthly limit: {self.monthly_limit}"
+        _log.debug(
+            "SavingsAccount initialized with monthly limit: %s", self.monthly_limit
         )
 
     def get_withdrawal_limit(self) -> float:
         return min(self.balance, self.monthly_limit)
 
     def accrue_interest(self, rate: float):
-        debug_log(f"Account {self.account_number}: accruing interest at rate {rate}%")
+        _log.debug(
+            "Account %s: accruing interest at rate %s%%", self.account_number, rate
+        )
         interest = self.balance * rate / 100
         self.deposit(interest)
-        debug_log(f"Account {self.account_number}: interest accrued: {interest}")
+        _log.debug("Account %s: interest accrued: %s", self.account_number, interest)
 
 
 class CreditAccount(BankAccount):
@@ -147,12 +203,19 @@ class CreditAccount(BankAccount):
     ):
         super().__init__(owner, initial_balance)
         self.credit_limit = credit_limit
-        debug_log(f"CreditAccount initialized with credit limit: {credit_limit}")
+        _log.debug("CreditAccount initialized with credit limit: %s", credit_limit)
 
     def get_withdrawal_limit(self) -> float:
         return self.credit_limit + self.balance
 
 
+_ACCOUNT_TYPES = {
+    "current": CurrentAccount,
+    "savings": SavingsAccount,
+    "credit": CreditAccount,
+}
+
+
 class Client:
     def __init__(self, name: str):
         self.name = name
@@ -161,41 +224,39 @@ class Client:
             "savings": [],
             "credit": [],
         }
-        debug_log(f"Client created: {name}")
+        _log.debug("Client created: %s", name)
 
     def open_account(self, account_type: str, **kwargs) -> Optional[BankAccount]:
-        debug_log(f"Client {self.name}: opening {account_type} account")
+        _log.debug("Client %s: opening %s account", self.name, account_type)
 
-        account_types = {
-            "current": CurrentAccount,
-            "savings": SavingsAccount,
-            "credit": CreditAccount,
-        }
-
-        if account_type not in account_types:
-            debug_log(f"Client {self.name}: invalid account type {account_type}")
+        account_class = _ACCOUNT_TYPES.get(account_type)
+        if account_class is None:
+            _log.debug("Client %s: invalid account type %s", self.name, account_type)
             return None
 
-        account = account_types[account_type].create_account(self.name, **kwargs)
+        account = account_class.create_account(self.name, **kwargs)
         self.accounts[account_type].append(account)
-        debug_log(
-            f"Client {self.name}: account {account.account_number} opened successfully"
+        _log.debug(
+            "Client %s: account %s opened successfully",
+            self.name,
+            account.account_number,
         )
         return account
 
     def get_total_balance(self) -> float:
         total = sum(
-            account.balance
-            for accounts_list in self.accounts.values()
-            for account in accounts_list
+            map(attrgetter("balance"), chain.from_iterable(self.accounts.values()))
         )
-        debug_log(f"Client {self.name}: total balance calculated: {total}")
+        _log.debug("Client %s: total balance calculated: %s", self.name, total)
         return total
 
     def find_accounts_by_type(self, account_type: str) -> List[BankAccount]:
         accounts = self.accounts.get(account_type, [])
-        debug_log(
-            f"Client {self.name}: found {len(accounts)} accounts of type {account_type}"
+        _log.debug(
+            "Client %s: found %s accounts of type %s",
+            self.name,
+            len(accounts),
+            account_type,
         )
         return accounts
 
@@ -203,55 +264,74 @@ class Client:
 class BankAnalytics:
     @staticmethod
     def calculate_median_balance(accounts: List[BankAccount]) -> float:
-        debug_log(f"Calculating median balance for {len(accounts)} accounts")
+        _log.debug("Calculating median balance for %s accounts", len(accounts))
         if not accounts:
             return 0.0
-        balances = [account.balance for account in accounts]
-        result = median(balances)
-        debug_log(f"Median balance: {result}")
+        result = median(map(attrgetter("balance"), accounts))
+        _log.debug("Median balance: %s", result)
         return result
 
     @staticmethod
-    def find_large_transactions(account: BankAccount, threshold: float) -> List[Dict]:
-        debug_log(
-            f"Searching for transactions >= {threshold} in account {account.account_number}"
+    def find_large_transactions(
+        account: BankAccount, threshold: float
+    ) -> List[Transaction]:
+        _log.debug(
+            "Searching for transactions >= %s in account %s",
+            threshold,
+            account.account_number,
         )
         large_transactions = [
             transaction
             for transaction in account.transaction_history
-            if transaction["amount"] >= threshold
+            if transaction.amount >= threshold
         ]
-        debug_log(f"Found {len(large_transactions)} large transactions")
+        _log.debug("Found %s large transactions", len(large_transactions))
         return large_transactions
 
+    @staticmethod
+    def count_large_transactions(account: BankAccount, threshold: float) -> int:
+        matches = sum(
+            1
+            for transaction in account.transaction_history
+            if transaction.amount >= threshold
+        )
+        _log.debug(
+            "Counted %s transactions >= %s in account %s",
+            matches,
+            threshold,
+            account.account_number,
+        )
+        return matches
+
     @classmethod
     def generate_report(cls, client: Client) -> str:
-        debug_log(f"Generating report for client {client.name}")
+        _log.debug("Generating report for client %s", client.name)
 
-        report = f"=== REPORT FOR CLIENT: {client.name} ===\n\n"
+        parts = [f"=== REPORT FOR CLIENT: {client.name} ===\n\n"]
 
         for account_type, accounts in client.accounts.items():
             if accounts:
-                report += f"{account_type.upper()} ACCOUNTS:\n"
+                parts.append(f"{account_type.upper()} ACCOUNTS:\n")
                 for account in accounts:
-                    report += f"  {account.account_number}: ${account.balance:.2f}\n"
-                report += "\n"
+                    parts.append(
+                        f"  {account.account_number}: ${account.balance:.2f}\n"
+                    )
+                parts.append("\n")
 
-        report += f"TOTAL BALANCE: ${client.get_total_balance():.2f}\n"
+        parts.append(f"TOTAL BALANCE: ${client.get_total_balance():.2f}\n")
 
-        all_accounts = [
-            account for accounts in client.accounts.values() for account in accounts
-        ]
-        if all_accounts:
-            median_balance = cls.calculate_median_balance(all_accounts)
-            report += f"MEDIAN BALANCE: ${median_balance:.2f}\n"
+        balances = list(
+            map(attrgetter("balance"), chain.from_iterable(client.accounts.values()))
+        )
+        if balances:
+            parts.append(f"MEDIAN BALANCE: ${median(balances):.2f}\n")
 
-        debug_log(f"Report generated for client {client.name}")
-        return report
+        _log.debug("Report generated for client %s", client.name)
+        return "".join(parts)
 
 
 if __name__ == "__main__":
-    debug_log("===================== START =====================")
+    _log.debug("===================== START =====================")
 
     client = Client("John Smith")
 
@@ -269,7 +349,7 @@ if __name__ == "__main__":
 
     print(BankAnalytics.generate_report(client))
 
-    large_transactions = BankAnalytics.find_large_transactions(current, 10000)
-    print(f"\nLarge transactions: {len(large_transactions)}")
+    large_transactions = BankAnalytics.count_large_transactions(current, 10000)
+    print(f"\nLarge transactions: {large_transactions}")
 
-    debug_log("===================== END =====================")
+    _log.debug("===================== END =====================")
@@ -1,18 +1,23 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional
 from enum import Enum
+from operator import attrgetter, mul
+import logging
 import os
+import sys
 
 
 DEBUG = os.environ.get("DEBUG") == "1"
 
 
-def debug_log(message: str):
-    if DEBUG:
-        from datetime import datetime
-
-        timestamp = datetime.now().strftime("%H:%M:%S.%f")[:-3]
-        print(f"[DEBUG {timestamp}] {message}")
+_log = logging.getLogger(__name__)
+_handler = logging.StreamHandler(sys.stdout)
+_handler.setFormatter(
+    logging.Formatter("[DEBUG %(asctime)s.%(msecs)03d] %(message)s", "%H:%M:%S")
+)
+_log.addHandler(_handler)
+_log.setLevel(logging.DEBUG if DEBUG else logging.WARNING)
+_log.propagate = False
 
 
 class ItemType(Enum):
@@ -23,13 +28,19 @@ class ItemType(Enum):
 
 
 class Item(ABC):
+    __slots__ = ("name", "weight", "cost", "item_type")
+
     def __init__(self, name: str, weight: float, cost: int, item_type: ItemType):
         self.name = name
         self.weight = weight
         self.cost = cost
         self.item_type = item_type
-        debug_log(
-            f"Item created: {name} (weight: {weight}, cost: {cost}, type: {item_type.value})"
+        _log.debug(
+            "Item created: %s (weight: %s, cost: %s, type: %s)",
+            name,
+            weight,
+            cost,
+            item_type.value,
         )
 
     @abstractmethod
@@ -41,116 +52,165 @@ class Item(ABC):
 
 
 class Weapon(Item):
+    __slots__ = ("damage", "weapon_class")
+
     def __init__(
         self, name: str, weight: float, cost: int, damage: int, weapon_class: str
     ):
         super().__init__(name, weight, cost, ItemType.WEAPON)
         self.damage = damage
         self.weapon_class = weapon_class
-        debug_log(f"Weapon created: {name}, damage: {damage}, class: {weapon_class}")
+        _log.debug(
+            "Weapon created: %s, damage: %s, class: %s", name, damage, weapon_class
+        )
 
     def use(self, character):
-        debug_log(f"Attempting to equip weapon {self.name} on {character.name}")
+        _log.debug("Attempting to equip weapon %s on %s", self.name, character.name)
         if character.can_equip_weapon(self):
             character.equipment["weapon"] = self
-            debug_log(f"Weapon {self.name} equipped successfully")
+            _log.debug("Weapon %s equipped successfully", self.name)
             return True
-        debug_log(f"Cannot equip weapon {self.name} - class restriction")
+        _log.debug("Cannot equip weapon %s - class restriction", self.name)
         return False
 
 
 class Armor(Item):
+    __slots__ = ("defense",)
+
     def __init__(self, name: str, weight: float, cost: int, defense: int):
         super().__init__(name, weight, cost, ItemType.ARMOR)
         self.defense = defense
-        debug_log(f"Armor created: {name}, defense: {defense}")
+        _log.debug("Armor created: %s, defense: %s", name, defense)
 
     def use(self, character):
-        debug_log(f"Equipping armor {self.name} on {character.name}")
+        _log.debug("Equipping armor %s on %s", self.name, character.name)
         character.equipment["armor"] = self
         return True
 
 
 class Potion(Item):
+    __slots__ = ("effect", "value")
+
     def __init__(self, name: str, weight: float, cost: int, effect: str, value: int):
         super().__init__(name, weight, cost, ItemType.CONSUMABLE)
         self.effect = effect
         self.value = value
-        debug_log(f"Potion created: {name}, effect: {effect}, value: {value}")
+        _log.debug("Potion created: %s, effect: %s, value: %s", name, effect, value)
 
     def use(self, character):
-        debug_log(f"Using potion {self.name} on {character.name}")
+        _log.debug("Using potion %s on %s", self.name, character.name)
         if self.effect == "heal":
             character.health = min(character.max_health, character.health + self.value)
-            debug_log(
-                f"{character.name} healed for {self.value} HP, current health: {character.health}"
+            _log.debug(
+                "%s healed for %s HP, current health: %s",
+                character.name,
+                self.value,
+                character.health,
             )
         character.inventory.remove_item(self)
         return True
 
 
 class Material(Item):
+    __slots__ = ("material_type",)
+
     def __init__(self, name: str, weight: float, cost: int, material_type: str):
         super().__init__(name, weight, cost, ItemType.MATERIAL)
         self.material_type = material_type
-        debug_log(f"Material created: {name}, type: {material_type}")
+        _log.debug("Material created: %s, type: %s", name, material_type)
 
     def use(self, character):
-        debug_log(f"Material {self.name} cannot be used directly")
+        _log.debug("Material %s cannot be used directly", self.name)
         return False
 
 
 class Inventory:
+    _WEIGHT_SLACK = 1e-9
+
     def __init__(self, max_weight: float):
         self.max_weight = max_weight
         self.items: Dict[Item, int] = {}
-        debug_log(f"Inventory created with max weight: {max_weight}")
+        self._by_name: Dict[str, List[Item]] = {}
+        self._total_weight = 0.0
+        _log.debug("Inventory created with max weight: %s", max_weight)
 
-    def add_item(self, item: Item, quantity: int = 1) -> bool:
-        current_weight = self.calculate_weight(self.items)
+    def add_item(self, item: Item, quantity: int = 1, _DEBUG=DEBUG) -> bool:
+        current_weight = self._total_weight
         new_weight = current_weight + (item.weight * quantity)
 
-        debug_log(
-            f"Adding {quantity}x {item.name}, current: {current_weight}, new: {new_weight}, max: {self.max_weight}"
-        )
-
-        if new_weight > self.max_weight:
-            debug_log(f"Cannot add item - exceeds max weight")
-            return False
+        if __debug__ and _DEBUG:
+            _log.debug(
+                "Adding %sx %s, current: %s, new: %s, max: %s",
+                quantity,
+                item.name,
+                current_weight,
+                new_weight,
+                self.max_weight,
+            )
 
-        if item in self.items:
-            self.items[item] += quantity
-        else:
+        if new_weight > self.max_weight * (1 - self._WEIGHT_SLACK):
+            # The running total may carry rounding error; near or over the limit,
+            # decide against a full rescan instead.
+            self._total_weight = self.calculate_weight(self.items)
+            new_weight = self._total_weight + (item.weight * quantity)
+            if new_weight > self.max_weight:
+                if __debug__ and _DEBUG:
+                    _log.debug("Cannot add item - exceeds max weight")
+                return False
+
+        held = self.items.get(item)
+        if held is None:
             self.items[item] = quantity
+            self._by_name.setdefault(item.name, []).append(item)
+        else:
+            self.items[item] = held + quantity
+        self._total_weight = new_weight
 
-        debug_log(f"Item added successfully, now have {self.items[item]}x {item.name}")
+        if __debug__ and _DEBUG:
+            _log.debug(
+                "Item added successfully, now have %sx %s", self.items[item], item.name
+            )
         return True
 
-    def remove_item(self, item: Item, quantity: int = 1) -> bool:
-        debug_log(f"Removing {quantity}x {item.name}")
+    def remove_item(self, item: Item, quantity: int = 1, _DEBUG=DEBUG) -> bool:
+        if __debug__ and _DEBUG:
+            _log.debug("Removing %sx %s", quantity, item.name)
 
         if item not in self.items or self.items[item] < quantity:
-            debug_log(f"Cannot remove item - insufficient quantity")
+            if __debug__ and _DEBUG:
+                _log.debug("Cannot remove item - insufficient quantity")
             return False
 
         self.items[item] -= quantity
+        self._total_weight -= item.weight * quantity
         if self.items[item] == 0:
             del self.items[item]
-            debug_log(f"Item removed completely from inventory")
+            if not self.items:
+                self._total_weight = 0.0
+            same_name = self._by_name[item.name]
+            same_name.remove(item)
+            if not same_name:
+                del self._by_name[item.name]
+            if __debug__ and _DEBUG:
+                _log.debug("Item removed completely from inventory")
         else:
-            debug_log(f"Removed {quantity}x, {self.items[item]}x remaining")
+            if __debug__ and _DEBUG:
+                _log.debug("Removed %sx, %sx remaining", quantity, self.items[item])
 
         return True
 
     @staticmethod
-    def calculate_weight(items: Dict[Item, int]) -> float:
-        weight = sum(item.weight * quantity for item, quantity in items.items())
-        debug_log(f"Calculated total weight: {weight}")
+    def calculate_weight(items: Dict[Item, int], _DEBUG=DEBUG) -> float:
+        # Full rescan; Inventory keeps a running total and only rescans here
+        # to confirm that an item really does not fit.
+        weight = sum(map(mul, map(attrgetter("weight"), items), items.values()))
+        if __debug__ and _DEBUG:
+            _log.debug("Calculated total weight: %s", weight)
         return weight
 
     @classmethod
     def create_starter_inventory(cls):
-        debug_log("Creating starter inventory")
+        _log.debug("Creating starter inventory")
         inventory = cls(max_weight=50.0)
 
         water = Potion("Water", 0.5, 5, "heal", 10)
@@ -161,14 +221,12 @@ class Inventory:
         inventory.add_item(bread, 3)
         inventory.add_item(gold, 50)
 
-        debug_log("Starter inventory created")
+        _log.debug("Starter inventory created")
         return inventory
 
     def get_item_by_name(self, name: str) -> Optional[Item]:
-        for item in self.items:
-            if item.name == name:
-                return item
-        return None
+        same_name = self._by_name.get(name)
+        return same_name[0] if same_name else None
 
 
 class Character(ABC):
@@ -179,20 +237,23 @@ class Character(ABC):
         self.inventory = Inventory(max_weight)
         self.equipment: Dict[str, Optional[Item]] = {"weapon": None, "armor": None}
         self.level = 1
-        debug_log(
-            f"Character created: {name} (health: {health}, class: {self.__class__.__name__})"
+        _log.debug(
+            "Character created: %s (health: %s, class: %s)",
+            name,
+            health,
+            self.__class__.__name__,
         )
 
     def pick_up_item(self, item: Item, quantity: int = 1) -> bool:
-        debug_log(f"{self.name} attempting to pick up {quantity}x {item.name}")
+        _log.debug("%s attempting to pick up %sx %s", self.name, quantity, item.name)
         return self.inventory.add_item(item, quantity)
 
     def use_item(self, item_name: str) -> bool:
-        debug_log(f"{self.name} attempting to use item: {item_name}")
+        _log.debug("%s attempting to use item: %s", self.name, item_name)
         item = self.inventory.get_item_by_name(item_name)
 
         if not item:
-            debug_log(f"Item {item_name} not found in inventory")
+            _log.debug("Item %s not found in inventory", item_name)
             return False
 
         return item.use(self)
@@ -207,82 +268,103 @@ class Character(ABC):
 
     @classmethod
     def create_character(cls, character_class: str, name: str):
-        debug_log(
-            f"Creating character via factory: class={character_class}, name={name}"
+        _log.debug(
+            "Creating character via factory: class=%s, name=%s", character_class, name
         )
 
-        classes = {"warrior": Warrior, "mage": Mage, "archer": Archer}
-
-        if character_class.lower() not in classes:
-            debug_log(f"Invalid character class: {character_class}")
+        char_class = _CHARACTER_CLASSES.get(character_class.lower())
+        if char_class is None:
+            _log.debug("Invalid character class: %s", character_class)
             return None
 
-        char_class = classes[character_class.lower()]
         character = char_class(name)
         character.inventory = Inventory.create_starter_inventory()
 
-        debug_log(f"Character created successfully")
+        _log.debug("Character created successfully")
         return character
 
 
 class Warrior(Character):
+    ALLOWED_WEAPONS = frozenset({"sword", "axe", "mace"})
+
     def __init__(self, name: str):
         super().__init__(name, health=150, max_weight=80.0)
-        self.allowed_weapons = ["sword", "axe", "mace"]
-        debug_log(f"Warrior initialized, allowed weapons: {self.allowed_weapons}")
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "Warrior initialized, allowed weapons: %s", sorted(self.ALLOWED_WEAPONS)
+            )
 
-    def can_equip_weapon(self, weapon: Weapon) -> bool:
-        can_equip = weapon.weapon_class in self.allowed_weapons
-        debug_log(f"Warrior weapon check: {weapon.weapon_class} -> {can_equip}")
+    def can_equip_weapon(self, weapon: Weapon, _DEBUG=DEBUG) -> bool:
+        can_equip = weapon.weapon_class in self.ALLOWED_WEAPONS
+        if __debug__ and _DEBUG:
+            _log.debug("Warrior weapon check: %s -> %s", weapon.weapon_class, can_equip)
         return can_equip
 
-    def get_item_bonus(self, item: Item) -> float:
+    def get_item_bonus(self, item: Item, _DEBUG=DEBUG) -> float:
         if isinstance(item, Weapon):
             bonus = 1.2
-            debug_log(f"Warrior bonus for weapon: {bonus}x")
+            if __debug__ and _DEBUG:
+                _log.debug("Warrior bonus for weapon: %sx", bonus)
             return bonus
         return 1.0
 
 
 class Mage(Character):
+    ALLOWED_WEAPONS = frozenset({"staff", "wand"})
+
     def __init__(self, name: str):
         super().__init__(name, health=80, max_weight=40.0)
-        self.allowed_weapons = ["staff", "wand"]
-        debug_log(f"Mage initialized, allowed weapons: {self.allowed_weapons}")
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "Mage initialized, allowed weapons: %s", sorted(self.ALLOWED_WEAPONS)
+            )
 
-    def can_equip_weapon(self, weapon: Weapon) -> bool:
-        can_equip = weapon.weapon_class in self.allowed_weapons
-        debug_log(f"Mage weapon check: {weapon.weapon_class} -> {can_equip}")
+    def can_equip_weapon(self, weapon: Weapon, _DEBUG=DEBUG) -> bool:
+        can_equip = weapon.weapon_class in self.ALLOWED_WEAPONS
+        if __debug__ and _DEBUG:
+            _log.debug("Mage weapon check: %s -> %s", weapon.weapon_class, can_equip)
         return can_equip
 
-    def get_item_bonus(self, item: Item) -> float:
+    def get_item_bonus(self, item: Item, _DEBUG=DEBUG) -> float:
         if isinstance(item, Potion):
             bonus = 1.5
-            debug_log(f"Mage bonus for potion: {bonus}x")
+            if __debug__ and _DEBUG:
+                _log.debug("Mage bonus for potion: %sx", bonus)
             return bonus
         return 1.0
 
 
 class Archer(Character):
+    ALLOWED_WEAPONS = frozenset({"bow", "crossbow"})
+
     def __init__(self, name: str):
         super().__init__(name, health=100, max_weight=60.0)
-        self.allowed_weapons = ["bow", "crossbow"]
-        debug_log(f"Archer initialized, allowed weapons: {self.allowed_weapons}")
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug(
+                "Archer initialized, allowed weapons: %s", sorted(self.ALLOWED_WEAPONS)
+            )
 
-    def can_equip_weapon(self, weapon: Weapon) -> bool:
-        can_equip = weapon.weapon_class in self.allowed_weapons
-        debug_log(f"Archer weapon check: {weapon.weapon_class} -> {can_equip}")
+    def can_equip_weapon(self, weapon: Weapon, _DEBUG=DEBUG) -> bool:
+        can_equip = weapon.weapon_class in self.ALLOWED_WEAPONS
+        if __debug__ and _DEBUG:
+            _log.debug("Archer weapon check: %s -> %s", weapon.weapon_class, can_equip)
         return can_equip
 
-    def get_item_bonus(self, item: Item) -> float:
+    def get_item_bonus(self, item: Item, _DEBUG=DEBUG) -> float:
         if isinstance(item, Armor) and item.weight < 10:
             bonus = 1.3
-            debug_log(f"Archer bonus for light armor: {bonus}x")
+            if __debug__ and _DEBUG:
+                _log.debug("Archer bonus for light armor: %sx", bonus)
             return bonus
         return 1.0
 
 
+_CHARACTER_CLASSES = {"warrior": Warrior, "mage": Mage, "archer": Archer}
+
+
 class Recipe:
+    __slots__ = ("name", "required_level", "ingredients", "result")
+
     def __init__(
         self, name: str, required_level: int, ingredients: Dict[str, int], result: Item
     ):
@@ -290,7 +372,11 @@ class Recipe:
         self.required_level = required_level
         self.ingredients = ingredients
         self.result = result
-        debug_log(f"Recipe created: {name}, required level: {required_level}")
+        _log.debug("Recipe created: %s, required level: %s", name, required_level)
+
+
+_IRON_WEAPONS = frozenset({"sword", "axe"})
+_WOODEN_WEAPONS = frozenset({"staff", "wand"})
 
 
 class CraftingSystem:
@@ -298,7 +384,7 @@ class CraftingSystem:
 
     @classmethod
     def initialize_recipes(cls):
-        debug_log("Initializing crafting recipes")
+        _log.debug("Initializing crafting recipes")
 
         iron_sword = Weapon("Iron Sword", 5.0, 100, 25, "sword")
         wooden_staff = Weapon("Wooden Staff", 3.0, 80, 20, "staff")
@@ -310,69 +396,75 @@ class CraftingSystem:
             Recipe("Leather Armor", 2, {"Leather": 4, "Thread": 2}, leather_armor),
         ]
 
-        debug_log(f"Initialized {len(cls._recipes)} recipes")
+        _log.debug("Initialized %s recipes", len(cls._recipes))
 
     @staticmethod
     def available_recipes(character_level: int) -> List[Recipe]:
-        debug_log(f"Finding recipes for level {character_level}")
+        _log.debug("Finding recipes for level %s", character_level)
         available = [
             recipe
             for recipe in CraftingSystem._recipes
             if recipe.required_level <= character_level
         ]
-        debug_log(f"Found {len(available)} available recipes")
+        _log.debug("Found %s available recipes", len(available))
         return available
 
     @classmethod
     def craft_item(cls, recipe: Recipe, character: Character) -> Optional[Item]:
-        debug_log(f"Attempting to craft: {recipe.name}")
+        _log.debug("Attempting to craft: %s", recipe.name)
 
         if character.level < recipe.required_level:
-            debug_log(
-                f"Character level too low: {character.level} < {recipe.required_level}"
+            _log.debug(
+                "Character level too low: %s < %s",
+                character.level,
+                recipe.required_level,
             )
             return None
 
+        inventory = character.inventory
+        consume_list = []
         for ingredient_name, required_quantity in recipe.ingredients.items():
-            item = character.inventory.get_item_by_name(ingredient_name)
-            if not item or character.inventory.items[item] < required_quantity:
-                debug_log(
-                    f"Missing ingredient: {ingredient_name} (need {required_quantity})"
+            item = inventory.get_item_by_name(ingredient_name)
+            if not item or inventory.items[item] < required_quantity:
+                _log.debug(
+                    "Missing ingredient: %s (need %s)",
+                    ingredient_name,
+                    required_quantity,
                 )
                 return None
+            consume_list.append((item, required_quantity))
 
-        debug_log(f"All ingredients available, crafting {recipe.name}")
+        _log.debug("All ingredients available, crafting %s", recipe.name)
 
-        for ingredient_name, required_quantity in recipe.ingredients.items():
-            item = character.inventory.get_item_by_name(ingredient_name)
-            character.inventory.remove_item(item, required_quantity)
+        for item, required_quantity in consume_list:
+            inventory.remove_item(item, required_quantity)
 
-        character.inventory.add_item(recipe.result)
-        debug_log(f"Crafted {recipe.name} successfully")
+        inventory.add_item(recipe.result)
+        _log.debug("Crafted %s successfully", recipe.name)
         return recipe.result
 
     @classmethod
     def dismantle_item(cls, item: Item) -> Dict[str, int]:
-        debug_log(f"Dismantling item: {item.name}")
+        _log.debug("Dismantling item: %s", item.name)
 
         materials = {}
 
         if isinstance(item, Weapon):
-            if item.weapon_class in ["sword", "axe"]:
+            if item.weapon_class in _IRON_WEAPONS:
                 materials["Iron Ore"] = 2
                 materials["Wood"] = 1
-            elif item.weapon_class in ["staff", "wand"]:
+            elif item.weapon_class in _WOODEN_WEAPONS:
                 materials["Wood"] = 2
         elif isinstance(item, Armor):
             materials["Leather"] = 2
             materials["Thread"] = 1
 
-        debug_log(f"Dismantled into: {materials}")
+        _log.debug("Dismantled into: %s", materials)
         return materials
 
 
 if __name__ == "__main__":
-    debug_log("===================== START =====================")
+    _log.debug("===================== START =====================")
 
     CraftingSystem.initialize_recipes()
 
@@ -431,4 +523,4 @@ if __name__ == "__main__":
     materials = CraftingSystem.dismantle_item(sword)
     print(f"Dismantled {sword.name} into: {materials}")
 
-    debug_log("===================== END ========================")
+    _log.debug("===================== END ========================")